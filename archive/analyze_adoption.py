@@ -1,12 +1,18 @@
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 
 def load_data():
-    # Load and filter the data
-    df = pd.read_csv('data/song_velocity_table.csv')
-    
+    # Load and filter the data. Prefer the Parquet output, which already
+    # carries Week as datetime64; otherwise parse Week once here
+    if os.path.exists('data/song_velocity_table.parquet'):
+        df = pd.read_parquet('data/song_velocity_table.parquet')
+    else:
+        df = pd.read_csv('data/song_velocity_table.csv')
+        df['Week'] = pd.to_datetime(df['Week'])
+
     # Filter out monthly data (filenames with 'monthly' in them)
     df = df[~df['Song'].str.contains('artist level', case=False, na=False)]
     
@@ -16,73 +22,58 @@ def load_data():
     return df
 
 def analyze_adoption_patterns():
-    # Load the data
+    # Load the data (Week is already datetime64 from load_data)
     df = load_data()
-    
-    # Convert Week to datetime
-    df['Week'] = pd.to_datetime(df['Week'])
-    
-    # Initialize DataFrame to store city adoption metrics
-    city_adoption = pd.DataFrame()
-    
+
     # Get first activity date for each song (this will be treated as release date)
     song_release_dates = df[df['Current Period'] > 0].groupby('Song')['Week'].min()
-    
+
     print(f"\nAnalyzing {len(song_release_dates)} songs")
     print("\nSongs being analyzed:")
     for song in song_release_dates.index:
         print(f"- {song}")
-    
-    for city in df['City'].unique():
-        if city == 'All Cities':  # Skip aggregate data
-            continue
-            
-        city_data = df[df['City'] == city]
-        
-        # Analyze adoption for each song
-        for song in df['Song'].unique():
-            song_city_data = city_data[city_data['Song'] == song]
-            
-            if song_city_data.empty:
-                continue
-                
-            release_date = song_release_dates[song]
-            
-            # Find first activity for this city and song
-            song_city_activity = song_city_data[song_city_data['Current Period'] > 0]
-            if song_city_activity.empty:
-                continue
-                
-            first_activity = song_city_activity['Week'].min()
-            last_activity = song_city_activity['Week'].max()
-            
-            # Calculate weeks from release to first activity
-            weeks_to_adopt = (first_activity - release_date).days / 7
-            
-            # Calculate active weeks and total weeks since adoption
-            active_weeks = song_city_activity['Week'].nunique()
-            total_weeks = (last_activity - first_activity).days / 7 + 1 if first_activity else 0
-            
-            # Calculate engagement metrics
-            total_streams = song_city_data[song_city_data['Measure'].str.lower() == 'plays']['Current Period'].sum()
-            total_listeners = song_city_data[song_city_data['Measure'].str.lower() == 'listeners']['Current Period'].sum()
-            
-            # Calculate consistency score
-            consistency = (active_weeks / total_weeks) * 100 if total_weeks > 0 else 0
-            
-            # Add to city_adoption DataFrame
-            city_adoption = pd.concat([city_adoption, pd.DataFrame({
-                'City': [city],
-                'Song': [song],
-                'Release Date': [release_date],
-                'First Activity': [first_activity],
-                'Weeks to Adopt': [weeks_to_adopt],
-                'Total Streams': [total_streams],
-                'Total Listeners': [total_listeners],
-                'Active Weeks': [active_weeks],
-                'Consistency Score': [consistency]
-            })], ignore_index=True)
-    
+
+    # All per-(city, song) metrics in a few grouped passes instead of a
+    # Python loop over every city/song pair. Skip aggregate data up front
+    city_df = df[df['City'] != 'All Cities']
+    active = city_df[city_df['Current Period'] > 0]
+
+    adoption = active.groupby(['City', 'Song'], sort=False).agg(**{
+        'First Activity': ('Week', 'min'),
+        'Last Activity': ('Week', 'max'),
+        'Active Weeks': ('Week', 'nunique'),
+    })
+
+    # Engagement sums come from all rows of the pair, not just active ones;
+    # pairs with no rows for a measure keep the old empty-sum value of 0
+    plays = city_df[city_df['Measure'].str.lower() == 'plays']
+    listeners = city_df[city_df['Measure'].str.lower() == 'listeners']
+    adoption = adoption.join(plays.groupby(['City', 'Song'])['Current Period'].sum().rename('Total Streams'))
+    adoption = adoption.join(listeners.groupby(['City', 'Song'])['Current Period'].sum().rename('Total Listeners'))
+    adoption[['Total Streams', 'Total Listeners']] = adoption[['Total Streams', 'Total Listeners']].fillna(0)
+
+    # Keep the original loop's city-major, song-order row layout; pairs with
+    # no activity simply drop out, like the old per-pair skips
+    cities = [c for c in df['City'].unique() if c != 'All Cities']
+    pair_order = pd.MultiIndex.from_product([cities, df['Song'].unique()], names=['City', 'Song'])
+    adoption = adoption.reindex(pair_order).dropna(subset=['First Activity'])
+
+    # Vectorized date arithmetic: one timedelta subtraction per column
+    # rather than one Python call per pair
+    release = pd.Series(
+        song_release_dates.reindex(adoption.index.get_level_values('Song')).to_numpy(),
+        index=adoption.index,
+    )
+    adoption['Release Date'] = release
+    adoption['Weeks to Adopt'] = (adoption['First Activity'] - release).dt.days / 7
+    total_weeks = (adoption['Last Activity'] - adoption['First Activity']).dt.days / 7 + 1
+    adoption['Consistency Score'] = (adoption['Active Weeks'] / total_weeks).where(total_weeks > 0, 0) * 100
+
+    city_adoption = adoption.reset_index()[[
+        'City', 'Song', 'Release Date', 'First Activity', 'Weeks to Adopt',
+        'Total Streams', 'Total Listeners', 'Active Weeks', 'Consistency Score'
+    ]]
+
     # Calculate average adoption speed and consistency for each city across all songs
     city_summary = city_adoption.groupby('City').agg({
         'Weeks to Adopt': 'mean',
@@ -62,71 +62,59 @@ def analyze_adoption_patterns(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     # Filter out monthly and artist-level data
     df = df[~df['song'].str.contains('artist level', case=False, na=False)]
     df = df[df['grouping'] == 'city']
-    
+
     # Convert week to datetime if not already
     df['week'] = pd.to_datetime(df['week'])
-    
-    # Initialize DataFrame to store city adoption metrics
-    city_adoption = pd.DataFrame()
-    
+
     # Get first activity date for each song (this will be treated as release date)
     song_release_dates = df[df['current_period'] > 0].groupby('song')['week'].min()
-    
+
     print(f"\nAnalyzing {len(song_release_dates)} songs")
     print("\nSongs being analyzed:")
     for song in song_release_dates.index:
         print(f"- {song}")
-    
-    for city in df['city'].unique():
-        if city == 'All Cities':  # Skip aggregate data
-            continue
-            
-        city_data = df[df['city'] == city]
-        
-        # Analyze adoption for each song
-        for song in df['song'].unique():
-            song_city_data = city_data[city_data['song'] == song]
-            
-            if song_city_data.empty:
-                continue
-                
-            release_date = song_release_dates[song]
-            
-            # Find first activity for this city and song
-            song_city_activity = song_city_data[song_city_data['current_period'] > 0]
-            if song_city_activity.empty:
-                continue
-                
-            first_activity = song_city_activity['week'].min()
-            last_activity = song_city_activity['week'].max()
-            
-            # Calculate weeks from release to first activity
-            weeks_to_adopt = (first_activity - release_date).days / 7
-            
-            # Calculate active weeks and total weeks since adoption
-            active_weeks = song_city_activity['week'].nunique()
-            total_weeks = (last_activity - first_activity).days / 7 + 1 if first_activity else 0
-            
-            # Calculate engagement metrics
-            total_streams = song_city_data[song_city_data['measure'].str.lower() == 'plays']['current_period'].sum()
-            total_listeners = song_city_data[song_city_data['measure'].str.lower() == 'listeners']['current_period'].sum()
-            
-            # Calculate consistency score
-            consistency = (active_weeks / total_weeks) * 100 if total_weeks > 0 else 0
-            
-            # Add to city_adoption DataFrame
-            city_adoption = pd.concat([city_adoption, pd.DataFrame({
-                'city': [city],
-                'song': [song],
-                'release_date': [release_date],
-                'first_activity': [first_activity],
-                'weeks_to_adopt': [weeks_to_adopt],
-                'total_streams': [total_streams],
-                'total_listeners': [total_listeners],
-                'active_weeks': [active_weeks],
-                'consistency_score': [consistency]
-            })], ignore_index=True)
-    
+
+    # All per-(city, song) metrics in a few grouped passes instead of a
+    # Python loop over every city/song pair. Skip aggregate data up front
+    city_df = df[df['city'] != 'All Cities']
+    active = city_df[city_df['current_period'] > 0]
+
+    adoption = active.groupby(['city', 'song'], sort=False).agg(
+        first_activity=('week', 'min'),
+        last_activity=('week', 'max'),
+        active_weeks=('week', 'nunique'),
+    )
+
+    # Engagement sums come from all rows of the pair, not just active ones;
+    # pairs with no rows for a measure keep the old empty-sum value of 0
+    plays = city_df[city_df['measure'].str.lower() == 'plays']
+    listeners = city_df[city_df['measure'].str.lower() == 'listeners']
+    adoption = adoption.join(plays.groupby(['city', 'song'])['current_period'].sum().rename('total_streams'))
+    adoption = adoption.join(listeners.groupby(['city', 'song'])['current_period'].sum().rename('total_listeners'))
+    adoption[['total_streams', 'total_listeners']] = adoption[['total_streams', 'total_listeners']].fillna(0)
+
+    # Keep the original loop's city-major, song-order row layout; pairs with
+    # no activity simply drop out, like the old per-pair skips
+    cities = [c for c in df['city'].unique() if c != 'All Cities']
+    pair_order = pd.MultiIndex.from_product([cities, df['song'].unique()], names=['city', 'song'])
+    adoption = adoption.reindex(pair_order).dropna(subset=['first_activity'])
+
+    # Vectorized date arithmetic: one timedelta subtraction per column
+    # rather than one Python call per pair
+    release = pd.Series(
+        song_release_dates.reindex(adoption.index.get_level_values('song')).to_numpy(),
+        index=adoption.index,
+    )
+    adoption['release_date'] = release
+    adoption['weeks_to_adopt'] = (adoption['first_activity'] - release).dt.days / 7
+    total_weeks = (adoption['last_activity'] - adoption['first_activity']).dt.days / 7 + 1
+    adoption['consistency_score'] = (adoption['active_weeks'] / total_weeks).where(total_weeks > 0, 0) * 100
+
+    city_adoption = adoption.reset_index()[[
+        'city', 'song', 'release_date', 'first_activity', 'weeks_to_adopt',
+        'total_streams', 'total_listeners', 'active_weeks', 'consistency_score'
+    ]]
+
     # Calculate average adoption speed and consistency for each city across all songs
     city_summary = city_adoption.groupby('city').agg({
         'weeks_to_adopt': 'mean',
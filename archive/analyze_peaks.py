@@ -1,40 +1,57 @@
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from plot_utils import plot_city_trends, complete_timeseries_data
 
 def load_data():
-    # Load the consolidated song velocity table
-    return pd.read_csv('data/song_velocity_table.csv')
+    # Load the consolidated song velocity table. Prefer the Parquet output,
+    # which already carries Week as datetime64; otherwise parse Week once
+    # here so downstream code never re-parses date strings
+    if os.path.exists('data/song_velocity_table.parquet'):
+        df = pd.read_parquet('data/song_velocity_table.parquet')
+    else:
+        df = pd.read_csv('data/song_velocity_table.csv')
+        df['Week'] = pd.to_datetime(df['Week'])
+
+    # Normalize Measure once at load so downstream code compares against
+    # plain lowercase labels; categorical codes keep the groupbys on the
+    # integer fast path
+    df['Measure'] = df['Measure'].str.lower().astype('category')
+    for c in ['Song', 'City']:
+        df[c] = df[c].astype('category')
+    return df
 
 def analyze_peaks():
     # Load the data
     df = load_data()
     
-    # Separate streams and listeners data
-    streams_data = df[df['Measure'].str.lower() == 'plays'].copy()
-    listeners_data = df[df['Measure'].str.lower() == 'listeners'].copy()
-    
-    # Calculate peaks by city
-    city_peaks = pd.DataFrame()
-    
-    for city in df['City'].unique():
-        city_streams = streams_data[streams_data['City'] == city]
-        city_listeners = listeners_data[listeners_data['City'] == city]
-        
-        peak_streams = city_streams['Current Period'].max() if not city_streams.empty else 0
-        peak_listeners = city_listeners['Current Period'].max() if not city_listeners.empty else 0
-        
-        peak_streams_week = city_streams.loc[city_streams['Current Period'].idxmax()]['Week'] if not city_streams.empty else None
-        peak_listeners_week = city_listeners.loc[city_listeners['Current Period'].idxmax()]['Week'] if not city_listeners.empty else None
-        
-        city_peaks = pd.concat([city_peaks, pd.DataFrame({
-            'City': [city],
-            'Peak Streams': [peak_streams],
-            'Peak Streams Week': [peak_streams_week],
-            'Peak Listeners': [peak_listeners],
-            'Peak Listeners Week': [peak_listeners_week]
-        })], ignore_index=True)
+    # Separate streams and listeners views (Measure is already lowercase;
+    # copy-on-write makes defensive copies unnecessary)
+    streams_data = df[df['Measure'] == 'plays']
+    listeners_data = df[df['Measure'] == 'listeners']
+
+    # Calculate peaks by city in one grouped pass over (Measure, City)
+    # instead of a per-city loop with pd.concat inside it
+    cities = df['City'].unique()
+    agg = df.groupby(['Measure', 'City'], observed=True)['Current Period'].agg(['max', 'idxmax'])
+
+    def peaks_by_city(measure, value_label, week_label):
+        try:
+            measure_agg = agg.xs(measure, level='Measure')
+        except KeyError:
+            measure_agg = agg.iloc[0:0].droplevel('Measure')
+        peaks = pd.DataFrame({
+            value_label: measure_agg['max'],
+            week_label: df.loc[measure_agg['idxmax'], 'Week'].values,
+        }, index=measure_agg.index)
+        # Cities with no rows for this measure keep the old defaults:
+        # a peak of 0 and no peak week
+        return peaks.reindex(cities).fillna({value_label: 0})
+
+    city_peaks = peaks_by_city('plays', 'Peak Streams', 'Peak Streams Week').join(
+        peaks_by_city('listeners', 'Peak Listeners', 'Peak Listeners Week')
+    ).rename_axis('City').reset_index()
     
     # Sort by peak streams
     city_peaks = city_peaks.sort_values('Peak Streams', ascending=False)
@@ -1,31 +1,29 @@
 import os
 import pandas as pd
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from config import (
     songs_to_scrape,
     group_by,
     get_valid_weeks_for_song,
-    raw_week_endings,
-    raw_month_starts,
+    get_raw_week_endings,
+    get_raw_month_starts,
     output_html_file_template,
     output_csv_file_template,
     get_file_path
 )
+from file_utils import resolve_html_path
 
-def check_status(export_csv=False):
+def build_check_items():
     """
-    Check status of all files in the scraping pipeline, including both weekly and monthly data.
-    For artist-level data, only checks listeners (not plays).
+    Build the full list of (song, measure, period, period_type, html_path,
+    csv_path) tuples to check, for both weekly and monthly data. Artist-level
+    data only checks listeners (not plays).
     """
-    html_missing = []
-    csv_missing = []
-    csv_empty = []
-    csv_unreadable = []
-    html_empty = []
-
-    # Check both weekly and monthly data
-    for period_type, periods in [("weekly", raw_week_endings), ("monthly", raw_month_starts)]:
-        # Check song-level data
+    items = []
+
+    for period_type, periods in [("weekly", get_raw_week_endings()), ("monthly", get_raw_month_starts())]:
+        # Song-level data
         for song in songs_to_scrape:
             song_id = song["id"]
             song_name = song["name"]
@@ -35,7 +33,7 @@ def check_status(export_csv=False):
                 # For monthly data, only check listeners
                 # For weekly data, check both listeners and plays
                 measures = ["listeners"] if period_type == "monthly" else ["listeners", "plays"]
-                
+
                 for measure in measures:
                     # Get file paths using the same function as the scraping script
                     html_path = get_file_path(
@@ -46,7 +44,7 @@ def check_status(export_csv=False):
                         song_id=song_id,
                         group_by=group_by
                     )
-                    
+
                     # For monthly data, use a different pattern
                     if period_type == "monthly":
                         csv_path = f"parsed csvs/parsed_monthly_{measure}_by_{group_by}_{song_id}_{period}.csv"
@@ -59,30 +57,12 @@ def check_status(export_csv=False):
                             week=period
                         )
 
-                    # Check HTML file
-                    if not os.path.exists(html_path):
-                        html_missing.append((song_name, measure, period, period_type, "Missing HTML", html_path))
-                    elif os.path.getsize(html_path) == 0:
-                        html_empty.append((song_name, measure, period, period_type, "Empty HTML", html_path))
-
-                    # Check CSV file
-                    if not os.path.exists(csv_path):
-                        csv_missing.append((song_name, measure, period, period_type, "Missing CSV", csv_path))
-                    elif os.path.exists(csv_path):
-                        try:
-                            df = pd.read_csv(csv_path)
-                            if df.empty:
-                                csv_empty.append((song_name, measure, period, period_type, "Empty CSV", csv_path))
-                            elif len(df) < 2:  # Check if CSV has at least header and one row
-                                csv_empty.append((song_name, measure, period, period_type, "CSV has no data rows", csv_path))
-                        except Exception as e:
-                            csv_unreadable.append((song_name, measure, period, period_type, f"Unreadable CSV ({str(e)})", csv_path))
-
-        # Check artist-level data (only listeners)
+                    items.append((song_name, measure, period, period_type, html_path, csv_path))
+
+        # Artist-level data (only listeners)
         for period in periods:
-            # Only check listeners for artist-level data
             measure = "listeners"
-            
+
             html_path = get_file_path(
                 period_type=period_type,
                 measure=measure,
@@ -91,7 +71,7 @@ def check_status(export_csv=False):
                 song_id="artist",
                 group_by=group_by
             )
-            
+
             if period_type == "monthly":
                 csv_path = f"parsed csvs/parsed_monthly_{measure}_by_{group_by}_artist_{period}.csv"
             else:
@@ -103,30 +83,92 @@ def check_status(export_csv=False):
                     week=period
                 )
 
-            # Check HTML file
-            if not os.path.exists(html_path):
-                html_missing.append(("Artist Level", measure, period, period_type, "Missing HTML", html_path))
-            elif os.path.getsize(html_path) == 0:
-                html_empty.append(("Artist Level", measure, period, period_type, "Empty HTML", html_path))
-
-            # Check CSV file
-            if not os.path.exists(csv_path):
-                csv_missing.append(("Artist Level", measure, period, period_type, "Missing CSV", csv_path))
-            elif os.path.exists(csv_path):
-                try:
-                    df = pd.read_csv(csv_path)
-                    if df.empty:
-                        csv_empty.append(("Artist Level", measure, period, period_type, "Empty CSV", csv_path))
-                    elif len(df) < 2:  # Check if CSV has at least header and one row
-                        csv_empty.append(("Artist Level", measure, period, period_type, "CSV has no data rows", csv_path))
-                except Exception as e:
-                    csv_unreadable.append(("Artist Level", measure, period, period_type, f"Unreadable CSV ({str(e)})", csv_path))
-
-    # Combine all issues
-    all_issues = html_missing + html_empty + csv_missing + csv_empty + csv_unreadable
-    
+            items.append(("Artist Level", measure, period, period_type, html_path, csv_path))
+
+    return items
+
+def count_csv_data_rows(path, limit=2):
+    """
+    Count data rows in a CSV by reading at most the header plus `limit`
+    lines, instead of parsing the whole file. Returns (header_found,
+    data_rows_seen) where data_rows_seen caps at `limit`.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        if not header.strip():
+            return False, 0
+        rows = 0
+        while rows < limit:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                rows += 1
+        return True, rows
+
+def check_item(item):
+    """Run the HTML and CSV checks for one item, returning any issues found."""
+    song_name, measure, period, period_type, html_path, csv_path = item
+    issues = []
+
+    # Check HTML file: one stat covers both existence and size
+    # (resolve_html_path falls back to legacy uncompressed outputs)
+    try:
+        if os.path.getsize(resolve_html_path(html_path)) == 0:
+            issues.append((song_name, measure, period, period_type, "Empty HTML", html_path))
+    except OSError:
+        issues.append((song_name, measure, period, period_type, "Missing HTML", html_path))
+
+    # Check CSV file: a few-line byte probe replaces the full pd.read_csv
+    # parse that was only used to test emptiness
+    if not os.path.exists(csv_path):
+        issues.append((song_name, measure, period, period_type, "Missing CSV", csv_path))
+    else:
+        try:
+            header_found, data_rows = count_csv_data_rows(csv_path)
+            if not header_found or data_rows == 0:
+                issues.append((song_name, measure, period, period_type, "Empty CSV", csv_path))
+            elif data_rows < 2:  # Check if CSV has at least header and one row
+                issues.append((song_name, measure, period, period_type, "CSV has no data rows", csv_path))
+        except Exception as e:
+            issues.append((song_name, measure, period, period_type, f"Unreadable CSV ({str(e)})", csv_path))
+
+    return issues
+
+# Grouping order for the combined report: same category-major layout the
+# sequential version produced
+_ISSUE_ORDER = {"Missing HTML": 0, "Empty HTML": 1, "Missing CSV": 2}
+
+def _issue_bucket(label):
+    if label in _ISSUE_ORDER:
+        return _ISSUE_ORDER[label]
+    if label.startswith("Unreadable CSV"):
+        return 4
+    return 3  # Empty CSV / CSV has no data rows
+
+def check_status(export_csv=False):
+    """
+    Check status of all files in the scraping pipeline, including both weekly and monthly data.
+    For artist-level data, only checks listeners (not plays).
+
+    The per-file checks are I/O-latency-bound, so they run on a thread pool
+    instead of one sequential stat/parse per file.
+    """
+    items = build_check_items()
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(check_item, items))
+
+    # Combine all issues, keeping the category-major ordering (stable sort
+    # preserves traversal order within each category), and build the report
+    # frame straight from the tuples
+    all_issues = sorted(
+        (issue for issues in results for issue in issues),
+        key=lambda issue: _issue_bucket(issue[4]),
+    )
+
     if all_issues:
-        df = pd.DataFrame(
+        df = pd.DataFrame.from_records(
             all_issues,
             columns=["Song", "Measure", "Period", "Period Type", "Issue", "File Path"]
         )
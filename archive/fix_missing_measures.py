@@ -1,6 +1,7 @@
-import pandas as pd
-import glob
+import csv
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 
 def extract_measure_from_filename(filename):
     # Example filename: parsed_weekly_plays_by_city_1711474233_20250425.csv
@@ -9,51 +10,107 @@ def extract_measure_from_filename(filename):
         return parts[2]  # plays or listeners
     return None
 
+def _rename_header(file, columns, renames):
+    """Rewrite just the header line, streaming the body through untouched."""
+    tmp = file + ".tmp"
+    with open(file, "rb") as src, open(tmp, "wb") as dst:
+        src.readline()  # skip the old header
+        new_header = ",".join(renames.get(col, col) for col in columns) + "\n"
+        dst.write(new_header.encode("utf-8"))
+        shutil.copyfileobj(src, dst, length=1 << 20)
+    os.replace(tmp, file)
+
+def _append_constant_column(file, name, value):
+    """Append a constant column to every row; csv handles quoting."""
+    tmp = file + ".tmp"
+    with open(file, "r", encoding="utf-8", newline="") as src, \
+         open(tmp, "w", encoding="utf-8", newline="") as dst:
+        reader = csv.reader(src)
+        # Match the \n line endings pandas wrote
+        writer = csv.writer(dst, lineterminator="\n")
+        header = next(reader)
+        writer.writerow(header + [name])
+        for row in reader:
+            if row:
+                writer.writerow(row + [value])
+    os.replace(tmp, file)
+
+def _drop_column(file, drop_index):
+    """Rewrite the file with one column removed from every row."""
+    tmp = file + ".tmp"
+    with open(file, "r", encoding="utf-8", newline="") as src, \
+         open(tmp, "w", encoding="utf-8", newline="") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst, lineterminator="\n")
+        for row in reader:
+            if row:
+                writer.writerow(row[:drop_index] + row[drop_index + 1:])
+    os.replace(tmp, file)
+
+def _fix_one(file):
+    """
+    Fix a single CSV, returning (fixed, issue). Runs in a worker process,
+    so it only touches the one file and reports back instead of mutating
+    shared counters.
+    """
+    try:
+        # Reading the header line is enough to decide the fix; the old
+        # pandas read/to_csv round-trip re-parsed and re-serialized
+        # every byte just to touch one column
+        with open(file, "r", encoding="utf-8", newline="") as f:
+            header_line = f.readline()
+            if not header_line:
+                return False, None
+            # Skip files with a header but no data rows
+            if not f.readline().strip():
+                return False, None
+        columns = next(csv.reader([header_line]))
+        lowercase_columns = [col.lower() for col in columns]
+
+        # Check if any form of measure column exists
+        if 'measure' not in lowercase_columns:
+            measure = extract_measure_from_filename(file)
+            if measure:
+                print(f"Adding Measure column to {file}")
+                _append_constant_column(file, 'Measure', measure)
+                return True, None
+            return False, f"Could not extract measure from filename: {file}"
+        # If we have both 'measure' and 'Measure', fix it
+        if 'measure' in columns and 'Measure' not in columns:
+            print(f"Fixing case of measure column in {file}")
+            _rename_header(file, columns, {'measure': 'Measure'})
+            return True, None
+        if 'measure' in columns and 'Measure' in columns:
+            print(f"Removing duplicate measure column in {file}")
+            # Keep 'Measure' and drop 'measure'
+            _drop_column(file, columns.index('measure'))
+            return True, None
+        return False, None
+
+    except Exception as e:
+        return False, f"Error processing {file}: {str(e)}"
+
 def fix_missing_measures():
-    # Get all CSV files in the parsed csvs directory
-    csv_files = glob.glob("parsed csvs/*.csv")
-    files_fixed = 0
-    files_with_issues = []
-    
-    for file in csv_files:
-        try:
-            # Read the CSV
-            df = pd.read_csv(file)
-            
-            # Skip empty files
-            if df.empty:
-                continue
-            
-            # Convert all column names to lowercase for checking
-            lowercase_columns = [col.lower() for col in df.columns]
-            
-            # Check if any form of measure column exists
-            if 'measure' not in lowercase_columns and 'Measure' not in df.columns:
-                measure = extract_measure_from_filename(file)
-                if measure:
-                    print(f"Adding Measure column to {file}")
-                    df['Measure'] = measure
-                    df.to_csv(file, index=False)
-                    files_fixed += 1
-                else:
-                    files_with_issues.append(f"Could not extract measure from filename: {file}")
-            else:
-                # If we have both 'measure' and 'Measure', fix it
-                if 'measure' in df.columns and 'Measure' not in df.columns:
-                    print(f"Fixing case of measure column in {file}")
-                    df = df.rename(columns={'measure': 'Measure'})
-                    df.to_csv(file, index=False)
-                    files_fixed += 1
-                elif 'measure' in df.columns and 'Measure' in df.columns:
-                    print(f"Removing duplicate measure column in {file}")
-                    # Keep 'Measure' and drop 'measure'
-                    df = df.drop(columns=['measure'])
-                    df.to_csv(file, index=False)
-                    files_fixed += 1
-            
-        except Exception as e:
-            files_with_issues.append(f"Error processing {file}: {str(e)}")
-    
+    # Get all CSV files in the parsed csvs directory: one scandir pass
+    # beats glob's listdir-plus-stat walk, and the cached entry size lets
+    # zero-byte files be dropped before they're shipped to a worker
+    try:
+        with os.scandir("parsed csvs") as entries:
+            csv_files = [
+                e.path for e in entries
+                if e.is_file() and e.name.endswith(".csv") and e.stat().st_size > 0
+            ]
+    except FileNotFoundError:
+        csv_files = []
+
+    # Every file is independent, so fan the fixes out across cores; the
+    # chunksize keeps IPC overhead small relative to the per-file work
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(_fix_one, csv_files, chunksize=16))
+
+    files_fixed = sum(1 for fixed, _ in results if fixed)
+    files_with_issues = [issue for _, issue in results if issue]
+
     # Print summary
     print(f"\nSummary:")
     print(f"Files fixed: {files_fixed}")
@@ -63,4 +120,4 @@ def fix_missing_measures():
             print(f"- {issue}")
 
 if __name__ == "__main__":
-    fix_missing_measures() 
\ No newline at end of file
+    fix_missing_measures()
@@ -1,6 +1,9 @@
 import pandas as pd
+import numpy as np
 import glob
 import os
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 def extract_week_from_filename(filename):
     parts = os.path.basename(filename).split("_")
@@ -16,31 +19,62 @@ def extract_group_by_from_filename(filename):
 
 def load_all_csvs():
     all_files = glob.glob("plays_by_*.csv")
-    all_data = []
+    tables = []
 
+    # Parse each file with Arrow's multithreaded C++ CSV reader and attach
+    # the filename-derived columns as constant Arrow arrays; the single
+    # concat + to_pandas at the end replaces the per-file pandas frames
     for file in all_files:
         week = extract_week_from_filename(file)
         song_id = extract_song_id_from_filename(file)
         group_by = extract_group_by_from_filename(file)
-        df = pd.read_csv(file)
-        df["Week"] = week
-        df["Song ID"] = song_id
-        df["Grouping"] = group_by
-        all_data.append(df)
+        table = pacsv.read_csv(file)
+        n = table.num_rows
+        table = table.append_column("Week", pa.array([week] * n))
+        table = table.append_column("Song ID", pa.array([song_id] * n))
+        table = table.append_column("Grouping", pa.array([group_by] * n))
+        tables.append(table)
 
-    return pd.concat(all_data, ignore_index=True)
+    df = pa.concat_tables(tables, promote_options="default").to_pandas()
+
+    # Low-cardinality label columns: categorical codes make the groupbys in
+    # build_velocity hash small integers instead of strings
+    for c in ["Song ID", "Grouping"]:
+        df[c] = df[c].astype("category")
+
+    return df
 
 def build_velocity(df):
     df["Week"] = pd.to_datetime(df["Week"], format="%Y%m%d")
     df.sort_values(by=["Grouping","Song ID","Week"], inplace=True)
 
-    df["Δ Plays"] = df.groupby(["Grouping","Song ID"])["Current Period"].diff()
-    df["% Δ"] = df.groupby(["Grouping","Song ID"])["Current Period"].pct_change() * 100
+    # With the frame sorted by (Grouping, Song ID, Week), both deltas are a
+    # single shifted-array diff: blank out the previous value wherever the
+    # group changes instead of running two groupby-transform passes
+    cp = df["Current Period"].to_numpy(dtype="float64")
+    prev = np.empty_like(cp)
+    prev[0] = np.nan
+    prev[1:] = cp[:-1]
+
+    grouping_codes = df["Grouping"].cat.codes.to_numpy()
+    song_codes = df["Song ID"].cat.codes.to_numpy()
+    same_group = (grouping_codes[1:] == grouping_codes[:-1]) & (song_codes[1:] == song_codes[:-1])
+    prev[1:][~same_group] = np.nan
+
+    df["Δ Plays"] = cp - prev
+    # pct_change silently yields inf for a zero previous week; match that
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["% Δ"] = (cp / prev - 1) * 100
     return df
 
 def main():
     df = load_all_csvs()
     df = build_velocity(df)
+    # Parquet is the primary output: typed (Week stays datetime64),
+    # compressed and much faster to reload than CSV
+    df.to_parquet("song_velocity_table.parquet", engine="pyarrow", compression="zstd")
+    print("✅ song_velocity_table.parquet created with week-over-week changes")
+    # Keep the CSV alongside for consumers that still read it
     df.to_csv("song_velocity_table.csv", index=False)
     print("✅ song_velocity_table.csv created with week-over-week changes")
 
@@ -1,13 +1,25 @@
 # config.py
 from datetime import datetime, timedelta
+from functools import lru_cache
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 #from webdriver_manager.chrome import ChromeDriverManager
 import time
 import random
 import os
 import argparse
+import atexit
 import glob
+import gzip
+import pickle
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from file_utils import (
     get_file_path,
@@ -15,6 +27,7 @@ from file_utils import (
     get_file_key,
     ensure_directory_exists,
     parse_filename,
+    resolve_html_path,
     PERIOD_TYPES,
     MEASURES,
     GROUP_BY_OPTIONS,
@@ -41,6 +54,12 @@ def get_common_parser():
                        help="Which levels to scrape (song and/or artist)")
     return parser
 
+# URL pieces that never change within a run, assembled once instead of
+# per call; the split keeps the query-string order identical to before
+_TRENDS_BASE = f"https://artists.apple.com/ui/measure/artist/{artist_id}/trends"
+_TRENDS_SORT = f"&sortKey={sort_key}&sortOrder={sort_order}"
+_TRENDS_TAIL = f"&zoom={zoom}&groupBy={group_by}&annotationsVisible=true"
+
 def build_scrape_url(period_value, song_id=None, measure=None, period_type="weekly", level="song", log_urls=False):
     """Build URL for scraping with proper period format"""
     if measure is None:
@@ -49,37 +68,92 @@ def build_scrape_url(period_value, song_id=None, measure=None, period_type="week
         raise ValueError(f"period_type must be one of {PERIOD_TYPES}")
     if level not in LEVELS:
         raise ValueError(f"level must be one of {LEVELS}")
-    
+
     period_prefix = "m" if period_type == "monthly" else "w"
     period_value_for_url = period_value[:6] if period_type == "monthly" else period_value
-    
+
     url = (
-        f"https://artists.apple.com/ui/measure/artist/{artist_id}/trends"
+        f"{_TRENDS_BASE}"
         f"?period={period_prefix}~{period_value_for_url}"
-        f"&sortKey={sort_key}"
-        f"&sortOrder={sort_order}"
+        f"{_TRENDS_SORT}"
         f"&measure={measure}"
-        f"&zoom={zoom}"
-        f"&groupBy={group_by}"
-        f"&annotationsVisible=true"
+        f"{_TRENDS_TAIL}"
     )
-    
+
     if level == "song" and song_id:
         url += f"&filter=song~{song_id}"
-    
+
     if log_urls:
         print(f"\n🔗 URL for {level} level scrape:")
         print(f"   {url}")
     
     return url
 
+def tune_driver_connection_pool(driver, maxsize=20):
+    """
+    Raise the urllib3 pool size on the driver's chromedriver connection.
+
+    Every WebDriver command is an HTTP call to chromedriver, and the
+    default keep-alive pool holds a single connection. A larger
+    non-blocking pool keeps connections warm once several threads share a
+    session. Best-effort: leaves the defaults if selenium internals move.
+    """
+    try:
+        executor = driver.command_executor
+        executor._client_config.init_args_for_pool_manager = {
+            "init_args_for_pool_manager": {"maxsize": maxsize, "block": False}
+        }
+        executor._conn = executor._get_connection_manager()
+    except Exception:
+        pass
+
+def build_chrome_options(headless=False):
+    """
+    Build Chrome options for a scraping session.
+
+    Headless sessions (cookie replay and pool clones) skip the GPU,
+    extensions and image decoding — we only want the DOM — and use the
+    eager page-load strategy so driver.get returns at DOMContentLoaded
+    instead of waiting for every asset. The interactive login stays a
+    normal visible window.
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.page_load_strategy = "eager"
+    else:
+        options.add_argument("--start-maximized")
+    return options
+
+def block_nonessential_requests(driver):
+    """
+    Block images, fonts and analytics at the network layer via CDP.
+
+    The trends pages pull trackers, fonts and CDN imagery that the saved
+    DOM never needs; blocking them shrinks each load and lets the
+    table-ready wait fire sooner. Best-effort: skipped silently where CDP
+    is unavailable.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": [
+            "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg",
+            "*.woff", "*.woff2", "*.ttf",
+            "*google-analytics*", "*doubleclick*",
+        ]})
+    except Exception:
+        pass
+
 def start_logged_in_browser(url):
     """Start browser and wait for manual login"""
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
+    options = build_chrome_options()
     service = Service('/usr/local/bin/chromedriver')
     driver = webdriver.Chrome(service=service, options=options)
-    
+    tune_driver_connection_pool(driver)
+
     print(f"\n🔗 Navigating to login page...")
     print(f"   URL: {url}")
     driver.get(url)
@@ -87,6 +161,51 @@ def start_logged_in_browser(url):
     print("   Press ENTER after you have logged in...")
     input("   > ")
     print("✅ Login confirmed, continuing with scraping...")
+    # Login is done; the rest of this session only scrapes
+    block_nonessential_requests(driver)
+    return driver
+
+# Saved login cookies let later runs skip the manual login entirely
+cookie_file = "apple_cookies.pkl"
+cookie_max_age_seconds = 24 * 60 * 60
+
+def save_session_cookies(driver):
+    """Persist the driver's cookies so later runs can skip manual login."""
+    with open(cookie_file, "wb") as f:
+        pickle.dump(driver.get_cookies(), f)
+    print(f"🍪 Saved login cookies to {cookie_file}")
+
+def get_authenticated_driver(url):
+    """
+    Return a logged-in driver, replaying cookies saved less than 24h ago
+    so most runs skip the manual login. Falls back to the interactive
+    login (and refreshes the saved cookies) when the jar is missing,
+    stale or unreadable.
+    """
+    try:
+        if time.time() - os.path.getmtime(cookie_file) < cookie_max_age_seconds:
+            with open(cookie_file, "rb") as f:
+                cookies = pickle.load(f)
+            options = build_chrome_options(headless=True)
+            service = Service('/usr/local/bin/chromedriver')
+            driver = webdriver.Chrome(service=service, options=options)
+            tune_driver_connection_pool(driver)
+            block_nonessential_requests(driver)
+            # Cookies can only be set once the browser is on the domain
+            driver.get("https://artists.apple.com")
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    continue
+            driver.get(url)
+            print("✅ Reused saved login cookies, skipping manual login")
+            return driver
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    driver = start_logged_in_browser(url)
+    save_session_cookies(driver)
     return driver
 
 def get_scrape_log_message(
@@ -101,8 +220,47 @@ def get_scrape_log_message(
     log_message += f"{song_name if song_name else 'Artist Level'} for period {period_value}"
     return log_message
 
+# --- Background HTML writer ---
+# Saving page_source inline stalls the scrape loop for the duration of
+# each ~1 MB write (painful on USB/NFS). A single daemon thread drains a
+# bounded queue instead, so the scraping thread can move straight on to
+# the next driver.get while the previous page hits disk
+_write_q = queue.Queue(maxsize=32)
+_writer_thread = None
+
+def _writer_loop():
+    while True:
+        output_path, html = _write_q.get()
+        try:
+            # Encode once and write bytes in one shot: text mode would
+            # push the page through the incremental encoder in small
+            # chunks. Gzipped outputs use level 3, which already gets
+            # most of the win on repetitive SPA markup without much CPU
+            data = html.encode("utf-8")
+            if output_path.endswith(".gz"):
+                opener = gzip.open(output_path, "wb", compresslevel=3)
+            else:
+                opener = open(output_path, "wb", buffering=1 << 20)
+            with opener as f:
+                f.write(data)
+            print(f"✅ Saved HTML to {output_path}")
+        except OSError as e:
+            print(f"❌ Error writing {output_path}: {str(e)}")
+        finally:
+            _write_q.task_done()
+
+def _enqueue_html_write(output_path, html):
+    """Hand an HTML payload to the background writer, starting it lazily."""
+    global _writer_thread
+    if _writer_thread is None:
+        _writer_thread = threading.Thread(target=_writer_loop, daemon=True)
+        _writer_thread.start()
+        # Drain any queued writes before the interpreter exits
+        atexit.register(_write_q.join)
+    _write_q.put((output_path, html))
+
 def scrape_file(
-    driver, 
+    driver,
     url: str, 
     output_path: str, 
     level: str, 
@@ -122,16 +280,171 @@ def scrape_file(
             print(f"   🔗 URL: {url}")
 
         driver.get(url)
-        time.sleep(random.uniform(10, 19))
-        
+        # Wait for the trends table rows to render instead of sleeping a
+        # fixed 10-19s: the SPA signals readiness the moment the data lands.
+        # Fall back to a short grace period if the selector never shows up
+        # (e.g. an empty period with no table)
+        try:
+            WebDriverWait(driver, 25).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table tbody tr"))
+            )
+        except TimeoutException:
+            print(f"⚠️ Timed out waiting for trends table on {url}; saving page as-is")
+        # Small jitter so request timing doesn't look mechanical
+        time.sleep(random.uniform(0.5, 1.5))
+
+
         ensure_directory_exists(output_path)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        print(f"✅ Saved HTML to {output_path}")
+        _enqueue_html_write(output_path, driver.page_source)
     except Exception as e:
         print(f"❌ Error scraping {url}: {str(e)}")
         raise
 
+# --- 🧪 Experimental: replay requests without Chrome ---
+# The trends page is a SPA that fetches its data over XHR. Replaying those
+# requests with a plain HTTP session skips Chrome, JS evaluation and the
+# page-render wait entirely. The helpers below carry the logged-in
+# driver's cookies into a requests.Session; wiring them to the actual
+# api endpoint still requires confirming its path and params in devtools.
+
+def build_api_session(driver):
+    """Build a requests.Session carrying the logged-in driver's cookies."""
+    import requests  # deferred: only needed on the experimental path
+
+    session = requests.Session()
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"),
+        )
+    # Match the browser identity the cookies were issued to
+    session.headers.update({
+        "User-Agent": driver.execute_script("return navigator.userAgent"),
+        "Accept": "application/json, text/plain, */*",
+        "Referer": "https://artists.apple.com/",
+    })
+    return session
+
+def fetch_url_with_session(session, url, output_path, timeout=30):
+    """Fetch one URL over the cookie-replay session and save the body."""
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    ensure_directory_exists(output_path)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(response.text)
+    print(f"✅ Saved response to {output_path}")
+    return response
+
+async def fetch_urls_async(cookies, jobs, max_concurrency=10, timeout=30):
+    """
+    Fetch many (url, output_path) jobs concurrently over one httpx
+    AsyncClient, bounded by a semaphore to stay under rate limits.
+
+    cookies is a plain name->value dict (e.g. built from
+    driver.get_cookies()). Run with asyncio.run(fetch_urls_async(...)).
+    """
+    import asyncio
+    import httpx  # deferred: only needed on the experimental path
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with httpx.AsyncClient(
+        cookies=cookies,
+        timeout=timeout,
+        headers={
+            "Accept": "application/json, text/plain, */*",
+            "Referer": "https://artists.apple.com/",
+        },
+    ) as client:
+        async def fetch_one(url, output_path):
+            async with semaphore:
+                response = await client.get(url)
+                response.raise_for_status()
+                ensure_directory_exists(output_path)
+                with open(output_path, "w", encoding="utf-8") as f:
+                    f.write(response.text)
+                print(f"✅ Saved response to {output_path}")
+
+        await asyncio.gather(*(fetch_one(url, path) for url, path in jobs))
+
+def clone_logged_in_driver(driver):
+    """Start another Chrome session sharing the logged-in driver's cookies."""
+    options = build_chrome_options(headless=True)
+    service = Service('/usr/local/bin/chromedriver')
+    clone = webdriver.Chrome(service=service, options=options)
+    tune_driver_connection_pool(clone)
+    block_nonessential_requests(clone)
+    clone.get("https://artists.apple.com")
+    for cookie in driver.get_cookies():
+        try:
+            clone.add_cookie(cookie)
+        except Exception:
+            continue
+    return clone
+
+def scrape_files_concurrently(driver, pending_scrapes, period_type, log_urls=False, max_drivers=4):
+    """
+    Scrape all pending files across a small pool of logged-in drivers.
+
+    The scraping workload is latency-bound (each page spends most of its
+    time waiting on the network), so a few concurrent browser sessions cut
+    wall time roughly by the pool size. The logged-in driver is reused as
+    the first pool member and extra sessions are cloned from its cookies;
+    a queue hands each worker thread exclusive use of one driver at a time.
+    Extra drivers are quit before returning; the original is left open for
+    the caller to close.
+    """
+    n_drivers = max(1, min(max_drivers, len(pending_scrapes)))
+    drivers = [driver] + [clone_logged_in_driver(driver) for _ in range(n_drivers - 1)]
+    driver_pool = queue.Queue()
+    for d in drivers:
+        driver_pool.put(d)
+
+    start_time = time.time()
+    completed = 0
+    progress_lock = threading.Lock()
+
+    def scrape_job(job):
+        nonlocal completed
+        level, song_obj, period_value, html_file, measure = job
+        url = build_scrape_url(
+            period_value,
+            song_obj["id"] if song_obj else None,
+            measure=measure,
+            period_type=period_type,
+            log_urls=log_urls
+        )
+        d = driver_pool.get()
+        try:
+            scrape_file(
+                d,
+                url,
+                html_file,
+                level=level,
+                measure=measure,
+                period_type=period_type,
+                period_value=period_value,
+                song_name=song_obj["name"] if song_obj else None,
+                log_urls=log_urls
+            )
+        finally:
+            driver_pool.put(d)
+        with progress_lock:
+            completed += 1
+            print_progress(completed - 1, len(pending_scrapes), start_time)
+
+    try:
+        with ThreadPoolExecutor(max_workers=n_drivers) as executor:
+            list(executor.map(scrape_job, pending_scrapes))
+    finally:
+        for d in drivers[1:]:
+            try:
+                d.quit()
+            except Exception:
+                continue
+
 def print_progress(i, total, start_time):
     """Print progress with ETA"""
     elapsed = time.time() - start_time
@@ -145,7 +458,7 @@ def print_progress(i, total, start_time):
 
 # Output filename pattern
 
-output_html_file_template = "html outputs/page_source_{period_type}_{measure}_by_{group_by}_{song_id}_{week}.html"  # CHANGED
+output_html_file_template = "html outputs/page_source_{period_type}_{measure}_by_{group_by}_{song_id}_{week}.html.gz"  # CHANGED
 output_csv_file_template  = "parsed csvs/parsed_{period_type}_{measure}_by_{group_by}_{song_id}_{week}.csv"  # CHANGED
 
 
@@ -165,8 +478,29 @@ songs_to_scrape = [
     {'name': 'Holding On', 'id': '1711474240', 'release_date': '20231110'}
 ]
 
+# Release dates parsed once at import; every consumer below does a dict
+# lookup instead of re-running strptime on the same strings
+song_release_dt_by_id = {
+    song['id']: datetime.strptime(song['release_date'], '%Y%m%d')
+    for song in songs_to_scrape
+}
+earliest_release_dt = min(song_release_dt_by_id.values())
+
+# Pandas-typed views of the same dates for analysis code that works in
+# Timestamps rather than datetimes
+song_id_to_release = {sid: pd.Timestamp(dt) for sid, dt in song_release_dt_by_id.items()}
+song_release_series = pd.Series(
+    {song['name']: pd.Timestamp(song['release_date']) for song in songs_to_scrape}
+)
+
+@lru_cache(maxsize=1)
 def get_last_full_friday(reference_date=None):
-    """Get the most recent Friday that begins a full 7-day Apple reporting period."""
+    """
+    Get the most recent Friday that begins a full 7-day Apple reporting period.
+
+    Cached for the life of the process: the result is deterministic per day
+    and both period generators ask for it.
+    """
     reference_date = reference_date or datetime.today()
     safe_reference = reference_date - timedelta(days=7)
     days_since_friday = (safe_reference.weekday() - 4) % 7
@@ -176,25 +510,37 @@ def get_last_full_friday(reference_date=None):
 def generate_raw_week_ending():
     """List all week-ending Fridays from the earliest song release up to latest complete week."""
     latest_friday = get_last_full_friday()
-    earliest_release = min(datetime.strptime(song["release_date"], "%Y%m%d") for song in songs_to_scrape)
-    
-    raw_weeks = []
-    current = latest_friday
-    while current >= earliest_release:
-        raw_weeks.append(current.strftime("%Y%m%d"))
-        current -= timedelta(weeks=1)
+    # One vectorized date_range anchored on the latest complete Friday
+    # replaces the week-by-week Python loop
+    n_weeks = (latest_friday - earliest_release_dt).days // 7 + 1
+    weeks = pd.date_range(end=latest_friday, periods=n_weeks, freq="7D")
+    return weeks.strftime("%Y%m%d")[::-1].tolist()
 
-    return sorted(raw_weeks, reverse=True)
 
+# All available weeks, computed lazily on first use so entry points that
+# only need URL or path helpers pay nothing at import time
+@lru_cache(maxsize=1)
+def get_raw_week_endings():
+    """All available week-ending dates, newest first."""
+    return generate_raw_week_ending()
 
-# All available weeks
-raw_week_endings = generate_raw_week_ending()
+# The same dates parsed once: every get_valid_weeks_for_song call compares
+# against these instead of re-running strptime over the whole list per song
+@lru_cache(maxsize=1)
+def _get_week_dt():
+    return [datetime.strptime(w, "%Y%m%d") for w in get_raw_week_endings()]
+
+# Utility: filter weeks to only include those on/after the song's release.
+# The filter is cached per release date (most songs share one), since the
+# planning and status scripts ask for the same lists over and over
+@lru_cache(maxsize=None)
+def _valid_weeks_for_release(release_date):
+    release_dt = datetime.strptime(release_date, "%Y%m%d")
+    return tuple(w for w, dt in zip(get_raw_week_endings(), _get_week_dt()) if dt >= release_dt)
 
-# Utility: filter weeks to only include those on/after the song's release
 def get_valid_weeks_for_song(song):
     """Get valid weeks for a song based on its release date."""
-    release_dt = datetime.strptime(song["release_date"], "%Y%m%d")
-    return [w for w in raw_week_endings if datetime.strptime(w, "%Y%m%d") >= release_dt]
+    return list(_valid_weeks_for_release(song["release_date"]))
 
 # Generate 1st-of-month dates for fully completed months up to now
 def generate_month_start_dates():
@@ -212,21 +558,17 @@ def generate_month_start_dates():
             current = datetime(latest.year, latest.month - 1, 1)
     
     # Start from earliest release date
-    earliest = min(datetime.strptime(song["release_date"], "%Y%m%d") for song in songs_to_scrape)
-    earliest = datetime(earliest.year, earliest.month, 1)  # First of month
-    
-    dates = []
-    while current >= earliest:
-        dates.append(current.strftime("%Y%m01"))
-        # Move to previous month
-        if current.month == 1:
-            current = datetime(current.year - 1, 12, 1)
-        else:
-            current = datetime(current.year, current.month - 1, 1)
-    
-    return sorted(dates, reverse=True)
+    earliest = datetime(earliest_release_dt.year, earliest_release_dt.month, 1)  # First of month
+
+    # One vectorized month-start range replaces the month-by-month loop
+    months = pd.date_range(start=earliest, end=current, freq="MS")
+    return months.strftime("%Y%m01")[::-1].tolist()
 
-raw_month_starts = generate_month_start_dates()
+# Lazy like get_raw_week_endings: nothing is generated until a caller asks
+@lru_cache(maxsize=1)
+def get_raw_month_starts():
+    """All available month-start dates, newest first."""
+    return generate_month_start_dates()
 
 
 # --- 🔬 Optional Small-Batch Debugging Block ---
@@ -236,8 +578,8 @@ raw_month_starts = generate_month_start_dates()
 #     {'name': 'Breaking Me Down', 'id': '1807227249', 'release_date': '20250425'},
 #     {'name': 'That Thing', 'id': '1807227251', 'release_date': '20250321'}
 # ]
-# raw_week_endings = ["20250502", "20250425"]
-# raw_month_starts = ["20250401", "20250301"]  # Add this line
+# get_raw_week_endings = lambda: ["20250502", "20250425"]
+# get_raw_month_starts = lambda: ["20250401", "20250301"]  # Add this line
 # # measures = ["listeners"]
 # ---- end small-batch debugging ---
 
@@ -247,120 +589,96 @@ def get_song_id_for_level(level, song_id):
         return "artist"
     return song_id
 
-def build_pending_scrapes(measures, levels, data_type, force=False):
-    """Build list of files that need to be scraped"""
-    pending_scrapes = []
+def iter_scrape_targets(measures, levels, data_type):
+    """
+    Yield every candidate scrape target as (level, song, period, html_file,
+    measure), in the same measure-major order the old nested loops used.
+    Shared by build_pending_scrapes and print_scraping_plan so the
+    measures x levels x songs x periods walk exists in one place.
+    """
     period_type = "monthly" if data_type == 'm' else "weekly"
-    
+
     for measure in measures:
         for level in levels:
             if level == "artist":
-                periods = raw_month_starts if data_type == 'm' else raw_week_endings
+                songs = [None]
+            else:
+                songs = songs_to_scrape
+            for song in songs:
+                if level == "artist":
+                    song_id = "artist"
+                    periods = get_raw_month_starts() if data_type == 'm' else get_raw_week_endings()
+                else:
+                    song_id = song["id"]
+                    periods = get_raw_month_starts() if data_type == 'm' else get_valid_weeks_for_song(song)
                 for period in periods:
                     html_file = get_file_path(
                         period_type=period_type,
                         measure=measure,
                         period_value=period,
                         level=level,
-                        song_id="artist",
+                        song_id=song_id,
                         group_by=group_by
                     )
-                    if should_process_file(html_file, set(), force):
-                        pending_scrapes.append((level, None, period, html_file, measure))
-            else:
-                for song in songs_to_scrape:
-                    song_id = song["id"]
-                    periods = raw_month_starts if data_type == 'm' else get_valid_weeks_for_song(song)
-                    for period in periods:
-                        html_file = get_file_path(
-                            period_type=period_type,
-                            measure=measure,
-                            period_value=period,
-                            level=level,
-                            song_id=song_id,
-                            group_by=group_by
-                        )
-                        if should_process_file(html_file, set(), force):
-                            pending_scrapes.append((level, song, period, html_file, measure))
-    return pending_scrapes
+                    yield (level, song, period, html_file, measure)
+
+def build_pending_scrapes(measures, levels, data_type, force=False):
+    """Build list of files that need to be scraped"""
+    # One scandir pass caches name and size for every output file, so each
+    # candidate check is a dict lookup with no further syscalls
+    try:
+        with os.scandir("html outputs") as entries:
+            existing_html = {e.name: e.stat().st_size for e in entries if e.is_file()}
+    except FileNotFoundError:
+        existing_html = {}
+
+    def needs_scrape(html_file):
+        if force:
+            return True
+        name = os.path.basename(html_file)
+        size = existing_html.get(name)
+        if size is None and name.endswith(".gz"):
+            # Legacy uncompressed file from before the gzip switch
+            size = existing_html.get(name[:-3])
+        # Missing, empty and near-empty files are all re-scraped, matching
+        # should_process_file's threshold
+        return size is None or size <= 10
+
+    return [
+        target
+        for target in iter_scrape_targets(measures, levels, data_type)
+        if needs_scrape(target[3])
+    ]
 
 def print_scraping_plan(level_choice, data_type):
     """Print the scraping plan based on selected options"""
     print("\n📋 Scraping Plan:")
-    
-    if level_choice == 'a':
-        periods = raw_month_starts if data_type == 'm' else raw_week_endings
-        pending_periods = []
-        for period in periods:
-            html_file = get_file_path(
-                period_type='monthly' if data_type == 'm' else 'weekly',
-                measure='plays',
-                period_value=period,
-                level='artist',
-                song_id='artist',
-                group_by=group_by
-            )
-            if not os.path.exists(html_file):
-                pending_periods.append(period)
-        print(f" Artist Level — {len(pending_periods)} periods to scrape")
-    elif level_choice == 's':
-        for song in songs_to_scrape:
-            song_id = song["id"]
-            periods = raw_month_starts if data_type == 'm' else get_valid_weeks_for_song(song)
-            pending_periods = []
-            for period in periods:
-                html_file = get_file_path(
-                    period_type='monthly' if data_type == 'm' else 'weekly',
-                    measure='plays',
-                    period_value=period,
-                    level='song',
-                    song_id=song_id,
-                    group_by=group_by
-                )
-                if not os.path.exists(html_file):
-                    pending_periods.append(period)
-            print(f" {song['name']} — {len(pending_periods)} periods to scrape")
-    else:  # both
-        # Artist level
-        periods = raw_month_starts if data_type == 'm' else raw_week_endings
-        pending_periods = []
-        for period in periods:
-            html_file = get_file_path(
-                period_type='monthly' if data_type == 'm' else 'weekly',
-                measure='plays',
-                period_value=period,
-                level='artist',
-                song_id='artist',
-                group_by=group_by
-            )
-            if not os.path.exists(html_file):
-                pending_periods.append(period)
-        print(f" Artist Level — {len(pending_periods)} periods to scrape")
-        
-        # Song level
+
+    levels = ["artist"] if level_choice == 'a' else ["song"] if level_choice == 's' else ["artist", "song"]
+
+    # Pre-register every entity so songs with no valid periods still print
+    # a zero count, then walk the shared target generator once
+    pending_counts = {}
+    if "artist" in levels:
+        pending_counts["Artist Level"] = 0
+    if "song" in levels:
         for song in songs_to_scrape:
-            song_id = song["id"]
-            periods = raw_month_starts if data_type == 'm' else get_valid_weeks_for_song(song)
-            pending_periods = []
-            for period in periods:
-                html_file = get_file_path(
-                    period_type='monthly' if data_type == 'm' else 'weekly',
-                    measure='plays',
-                    period_value=period,
-                    level='song',
-                    song_id=song_id,
-                    group_by=group_by
-                )
-                if not os.path.exists(html_file):
-                    pending_periods.append(period)
-            print(f" {song['name']} — {len(pending_periods)} periods to scrape")
+            pending_counts[song["name"]] = 0
+
+    for level, song, period, html_file, measure in iter_scrape_targets(["plays"], levels, data_type):
+        if not os.path.exists(resolve_html_path(html_file)):
+            name = "Artist Level" if level == "artist" else song["name"]
+            pending_counts[name] += 1
+
+    for name, count in pending_counts.items():
+        print(f" {name} — {count} periods to scrape")
 
 def print_parsing_plan(level_choice, data_type):
     """Print the parsing plan based on selected options"""
     print("\n📋 Parsing Plan:")
     
     if level_choice == 'a':
-        periods = raw_month_starts if data_type == 'm' else raw_week_endings
+        periods = get_raw_month_starts() if data_type == 'm' else get_raw_week_endings()
         pending_periods = []
         for period in periods:
             html_file = get_file_path(
@@ -378,13 +696,13 @@ def print_parsing_plan(level_choice, data_type):
                 song_id='artist',
                 group_by=group_by
             )
-            if os.path.exists(html_file) and not os.path.exists(csv_file):
+            if os.path.exists(resolve_html_path(html_file)) and not os.path.exists(csv_file):
                 pending_periods.append(period)
         print(f" Artist Level — {len(pending_periods)} periods to parse")
     elif level_choice == 's':
         for song in songs_to_scrape:
             song_id = song["id"]
-            periods = raw_month_starts if data_type == 'm' else get_valid_weeks_for_song(song)
+            periods = get_raw_month_starts() if data_type == 'm' else get_valid_weeks_for_song(song)
             pending_periods = []
             for period in periods:
                 html_file = get_file_path(
@@ -402,12 +720,12 @@ def print_parsing_plan(level_choice, data_type):
                     song_id=song_id,
                     group_by=group_by
                 )
-                if os.path.exists(html_file) and not os.path.exists(csv_file):
+                if os.path.exists(resolve_html_path(html_file)) and not os.path.exists(csv_file):
                     pending_periods.append(period)
             print(f" {song['name']} — {len(pending_periods)} periods to parse")
     else:  # both
         # Artist level
-        periods = raw_month_starts if data_type == 'm' else raw_week_endings
+        periods = get_raw_month_starts() if data_type == 'm' else get_raw_week_endings()
         pending_periods = []
         for period in periods:
             html_file = get_file_path(
@@ -425,14 +743,14 @@ def print_parsing_plan(level_choice, data_type):
                 song_id='artist',
                 group_by=group_by
             )
-            if os.path.exists(html_file) and not os.path.exists(csv_file):
+            if os.path.exists(resolve_html_path(html_file)) and not os.path.exists(csv_file):
                 pending_periods.append(period)
         print(f" Artist Level — {len(pending_periods)} periods to parse")
         
         # Song level
         for song in songs_to_scrape:
             song_id = song["id"]
-            periods = raw_month_starts if data_type == 'm' else get_valid_weeks_for_song(song)
+            periods = get_raw_month_starts() if data_type == 'm' else get_valid_weeks_for_song(song)
             pending_periods = []
             for period in periods:
                 html_file = get_file_path(
@@ -450,27 +768,38 @@ def print_parsing_plan(level_choice, data_type):
                     song_id=song_id,
                     group_by=group_by
                 )
-                if os.path.exists(html_file) and not os.path.exists(csv_file):
+                if os.path.exists(resolve_html_path(html_file)) and not os.path.exists(csv_file):
                     pending_periods.append(period)
             print(f" {song['name']} — {len(pending_periods)} periods to parse")
 
+# Parsed-CSV filename structure, compiled once; matching extracts all key
+# fields in one pass with no per-file split/replace allocations
+_PARSED_RE = re.compile(
+    r"^parsed_(?P<period_type>[^_]+)_(?P<measure>[^_]+)"
+    r"_by_(?P<group_by>[^_]+)_(?P<song_id>[^_]+)_(?P<week>\d{8})\.csv$"
+)
+
+@lru_cache(maxsize=1)
 def get_existing_parsed_files():
-    """Get a set of already parsed files"""
+    """
+    Get a set of already parsed files.
+
+    The directory scan is cached for the life of the process; call
+    get_existing_parsed_files.cache_clear() after writing new parsed CSVs
+    if the set needs to be re-read in the same run.
+    """
     parsed_files = set()
-    csv_pattern = "parsed csvs/parsed_*.csv"
-    
-    for csv_file in glob.glob(csv_pattern):
-        try:
-            file_info = parse_filename(csv_file)
-            file_key = get_file_key(
-                file_info['period_type'],
-                file_info['measure'],
-                file_info['group_by'],
-                file_info['song_id'],
-                file_info['week']
-            )
-            parsed_files.add(file_key)
-        except ValueError:
+
+    for csv_file in glob.glob("parsed csvs/parsed_*.csv"):
+        match = _PARSED_RE.match(os.path.basename(csv_file))
+        if match is None:
             continue
-    
+        parsed_files.add(get_file_key(
+            match['period_type'],
+            match['measure'],
+            match['group_by'],
+            match['song_id'],
+            match['week']
+        ))
+
     return parsed_files
\ No newline at end of file
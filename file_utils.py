@@ -1,17 +1,29 @@
+import gzip
 import os
-from typing import Dict, Tuple, Optional
+import sys
+from functools import lru_cache
+from typing import Dict, Optional
 
-# File naming conventions
-HTML_FILE_TEMPLATE = "html outputs/page_source_{period_type}_{measure}_by_{group_by}_{song_id}_{week}.html"
+# File naming conventions. HTML is stored gzipped: the SPA markup is >1 MB
+# of boilerplate per page and compresses 5-10x, cutting both disk footprint
+# and the parser's read bandwidth
+HTML_FILE_TEMPLATE = "html outputs/page_source_{period_type}_{measure}_by_{group_by}_{song_id}_{week}.html.gz"
 CSV_FILE_TEMPLATE = "parsed csvs/parsed_{period_type}_{measure}_by_{group_by}_{song_id}_{week}.csv"
 ANALYSIS_OUTPUT_DIR = "analysis_outputs"
 
-# File path components
+# File path components. The lists keep a stable order for argparse
+# choices and error messages; the frozensets answer the membership checks
+# on the hot path-building path in O(1)
 PERIOD_TYPES = ["weekly", "monthly"]
 MEASURES = ["plays", "listeners"]
 GROUP_BY_OPTIONS = ["city"]  # Currently only city, but could expand
 LEVELS = ["song", "artist"]
 
+_PERIOD_TYPE_SET = frozenset(PERIOD_TYPES)
+_MEASURE_SET = frozenset(MEASURES)
+_GROUP_BY_SET = frozenset(GROUP_BY_OPTIONS)
+_LEVEL_SET = frozenset(LEVELS)
+
 def get_file_path(
     period_type: str,
     measure: str,
@@ -34,22 +46,43 @@ def get_file_path(
     Returns:
         The full file path
     """
-    if period_type not in PERIOD_TYPES:
+    if period_type not in _PERIOD_TYPE_SET:
         raise ValueError(f"period_type must be one of {PERIOD_TYPES}")
-    if measure not in MEASURES:
+    if measure not in _MEASURE_SET:
         raise ValueError(f"measure must be one of {MEASURES}")
-    if group_by not in GROUP_BY_OPTIONS:
+    if group_by not in _GROUP_BY_SET:
         raise ValueError(f"group_by must be one of {GROUP_BY_OPTIONS}")
-    if level not in LEVELS:
+    if level not in _LEVEL_SET:
         raise ValueError(f"level must be one of {LEVELS}")
         
-    return HTML_FILE_TEMPLATE.format(
-        period_type=period_type,
-        measure=measure,
-        group_by=group_by,
-        song_id=song_id,
-        week=period_value
-    )
+    # f-string beats str.format in the tight planning loops that call this
+    # thousands of times per run
+    return f"html outputs/page_source_{period_type}_{measure}_by_{group_by}_{song_id}_{period_value}.html.gz"
+
+def resolve_html_path(html_path: str) -> str:
+    """
+    Resolve an HTML output path to the file actually on disk.
+
+    New scrapes are written gzipped, but runs from before the switch left
+    plain .html files behind. If the .gz file is missing and the legacy
+    uncompressed file exists, return that; otherwise return the path
+    unchanged.
+    """
+    if html_path.endswith(".gz") and not os.path.exists(html_path):
+        legacy_path = html_path[:-3]
+        if os.path.exists(legacy_path):
+            return legacy_path
+    return html_path
+
+def open_html_source(html_path: str):
+    """
+    Open an HTML output for reading as text, transparently handling both
+    gzipped and legacy uncompressed files.
+    """
+    resolved = resolve_html_path(html_path)
+    if resolved.endswith(".gz"):
+        return gzip.open(resolved, "rt", encoding="utf-8")
+    return open(resolved, "r", encoding="utf-8")
 
 def get_csv_path(
     period_type: str,
@@ -71,13 +104,7 @@ def get_csv_path(
     Returns:
         The full CSV file path
     """
-    return CSV_FILE_TEMPLATE.format(
-        period_type=period_type,
-        measure=measure,
-        group_by=group_by,
-        song_id=song_id,
-        week=period_value
-    )
+    return f"parsed csvs/parsed_{period_type}_{measure}_by_{group_by}_{song_id}_{period_value}.csv"
 
 def parse_filename(filename: str) -> Dict[str, str]:
     """
@@ -106,36 +133,64 @@ def parse_filename(filename: str) -> Dict[str, str]:
         'week': parts[6].replace('.csv', '')
     }
 
+def parse_filenames(paths) -> Dict[str, "object"]:
+    """
+    Parse components from a batch of filenames at once.
+
+    Vectorized counterpart to parse_filename for callers scanning whole
+    directories: one pandas str.split replaces the per-file Python loop.
+
+    Args:
+        paths: Iterable of file paths in the standard naming convention
+
+    Returns:
+        Dictionary of numpy arrays keyed like parse_filename's output
+        (period_type, measure, group_by, song_id, week), aligned with the
+        input order
+    """
+    import pandas as pd  # deferred: keeps import light for path-only callers
+
+    parts = pd.Series(list(paths), dtype="object").map(os.path.basename).str.split("_", n=6, expand=True)
+    if parts.shape[1] < 7:
+        raise ValueError("Invalid filename format in batch")
+    return {
+        'period_type': parts[1].to_numpy(),
+        'measure': parts[2].to_numpy(),
+        'group_by': parts[4].to_numpy(),
+        'song_id': parts[5].to_numpy(),
+        'week': parts[6].str.replace('.csv', '', regex=False).to_numpy(),
+    }
+
 def should_process_file(
     file_path: str,
     existing_files: set,
-    force: bool = False
+    force: bool = False,
+    dir_entry: Optional[os.DirEntry] = None
 ) -> bool:
     """
     Check if a file should be processed based on existence and force flag.
-    
+
     Args:
         file_path: Path to the file
         existing_files: Set of existing file keys
         force: Whether to force processing
-        
+        dir_entry: Optional os.DirEntry for the file from an os.scandir
+            walk; its cached stat avoids a fresh syscall
+
     Returns:
         True if the file should be processed, False otherwise
     """
     # Always process if force flag is set
     if force:
         return True
-        
-    # Process if file doesn't exist
-    if not os.path.exists(file_path):
-        return True
-        
-    # Process if file exists but is empty or too small
-    if os.path.getsize(file_path) <= 10:
+
+    # One stat answers both existence and size; missing, empty and
+    # near-empty files are all processed
+    try:
+        st = dir_entry.stat() if dir_entry is not None else os.stat(file_path)
+    except FileNotFoundError:
         return True
-        
-    # Don't process if file exists and has content
-    return False
+    return st.st_size <= 10
 
 def get_file_key(
     period_type: str,
@@ -143,27 +198,37 @@ def get_file_key(
     group_by: str,
     song_id: str,
     week: str
-) -> Tuple[str, str, str, str, str]:
+) -> str:
     """
     Generate a unique key for a file to track its processing status.
-    
+
     Args:
         period_type: 'weekly' or 'monthly'
         measure: 'plays' or 'listeners'
         group_by: Currently only 'city'
         song_id: The song ID or 'artist'
         week: The week or month value
-        
+
     Returns:
-        Tuple of (period_type, measure, group_by, song_id, week)
+        Interned "period_type|measure|group_by|song_id|week" string — one
+        object with a cached hash instead of a 5-tuple, which keeps the
+        planners' membership checks cheap when the parsed-file set is
+        large. Split on '|' if the components are ever needed back.
     """
-    return (period_type, measure, group_by, song_id, week)
+    return sys.intern(f"{period_type}|{measure}|{group_by}|{song_id}|{week}")
+
+# The scraping loops save thousands of files into the same couple of
+# output directories; caching per directory means one mkdir syscall per
+# unique directory per process instead of one per save
+@lru_cache(maxsize=None)
+def _mkdir_cached(dirname: str) -> None:
+    os.makedirs(dirname, exist_ok=True)
 
 def ensure_directory_exists(file_path: str) -> None:
     """
     Ensure the directory for a file exists.
-    
+
     Args:
         file_path: Path to the file
     """
-    os.makedirs(os.path.dirname(file_path), exist_ok=True) 
\ No newline at end of file
+    _mkdir_cached(os.path.dirname(file_path))
\ No newline at end of file
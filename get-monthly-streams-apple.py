@@ -1,21 +1,11 @@
 from config import (
-    songs_to_scrape,
-    # artist_id,
-    # sort_key,
-    # sort_order,
-    # zoom,
-    group_by,
-    output_html_file_template,
-    generate_month_start_dates,
     get_common_parser,
     build_scrape_url,
-    start_logged_in_browser,
-    scrape_file,
-    print_progress,
-    get_file_path
+    get_authenticated_driver,
+    scrape_files_concurrently,
+    build_pending_scrapes,
+    iter_scrape_targets
 )
-import os
-import time
 
 def parse_args():
     parser = get_common_parser()
@@ -27,41 +17,36 @@ def main():
     measures = args.measures
     levels = args.levels
     
+    # Check what needs scraping; the shared builder caches the output
+    # directory in one scandir pass instead of stat-ing every candidate
+    pending_scrapes = build_pending_scrapes(measures, levels, 'm', args.force)
+
+    # One summary line instead of per-candidate chatter
+    total = sum(1 for _ in iter_scrape_targets(measures, levels, 'm'))
+    print(f"📋 {len(pending_scrapes)} of {total} files need scraping")
+
+    if not pending_scrapes:
+        print("✅ No new HTML files to scrape. Everything is already up to date.")
+        return
+
     # Start browser
+    first_scrape = pending_scrapes[0]
     first_url = build_scrape_url(
-        period_value=raw_month_starts[0] if args.period_type == "monthly" else raw_week_endings[0],
-        song_id=None if "artist" in levels else songs_to_scrape[0]["id"],
-        measure=measures[0],
-        period_type=args.period_type
+        first_scrape[2],  # period_value
+        first_scrape[1]["id"] if first_scrape[0] == "song" else None,
+        measure=first_scrape[4],
+        period_type="monthly"
+    )
+    driver = get_authenticated_driver(first_url)
+
+    # Scrape files across a pool of logged-in drivers
+    scrape_files_concurrently(
+        driver,
+        pending_scrapes,
+        period_type="monthly",
+        log_urls=args.log_urls
     )
-    driver = start_logged_in_browser(first_url)
-    
-    # Scrape files
-    start_time = time.time()
-    for i, (level, song_obj, period_value, html_file, measure) in enumerate(pending_scrapes):
-        url = build_scrape_url(
-            period_value,
-            song_obj["id"] if song_obj else None,
-            measure=measure,
-            period_type=args.period_type,
-            log_urls=args.log_urls
-        )
-        
-        current_song_name = song_obj["name"] if song_obj else None
 
-        scrape_file(
-            driver,
-            url,
-            html_file,
-            level=level,
-            measure=measure,
-            period_type=args.period_type,
-            period_value=period_value,
-            song_name=current_song_name,
-            log_urls=args.log_urls
-        )
-        print_progress(i, len(pending_scrapes), start_time)
-    
     driver.quit()
     print("\n🎉 All scraping complete.")
 
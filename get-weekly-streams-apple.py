@@ -1,15 +1,11 @@
 from config import (
-    songs_to_scrape,
-    group_by,
     get_common_parser,
     build_scrape_url,
-    start_logged_in_browser,
-    scrape_file,
-    print_progress,
-    get_file_path
+    get_authenticated_driver,
+    scrape_files_concurrently,
+    build_pending_scrapes,
+    iter_scrape_targets
 )
-import time
-import os
 
 def parse_args():
     parser = get_common_parser()
@@ -21,39 +17,14 @@ def main():
     measures = args.measures
     levels = args.levels
     
-    # Check what needs scraping
-    pending_scrapes = []
-    for measure in measures:
-        for level in levels:
-            if level == "artist":
-                # For artist level, use raw_week_endings
-                for period_value in raw_week_endings:
-                    html_file = get_file_path(
-                        period_type="weekly",
-                        measure=measure,
-                        period_value=period_value,
-                        level=level,
-                        song_id="artist",
-                        group_by=group_by
-                    )
-                    if not os.path.exists(html_file) or args.force:
-                        pending_scrapes.append((level, None, period_value, html_file, measure))
-            else:
-                # For song level, iterate through songs
-                for song in songs_to_scrape:
-                    song_id = song["id"]
-                    for period_value in get_valid_weeks_for_song(song):
-                        html_file = get_file_path(
-                            period_type="weekly",
-                            measure=measure,
-                            period_value=period_value,
-                            level=level,
-                            song_id=song_id,
-                            group_by=group_by
-                        )
-                        if not os.path.exists(html_file) or args.force:
-                            pending_scrapes.append((level, song, period_value, html_file, measure))
-    
+    # Check what needs scraping; the shared builder caches the output
+    # directory in one scandir pass instead of stat-ing every candidate
+    pending_scrapes = build_pending_scrapes(measures, levels, 'w', args.force)
+
+    # One summary line instead of per-candidate chatter
+    total = sum(1 for _ in iter_scrape_targets(measures, levels, 'w'))
+    print(f"📋 {len(pending_scrapes)} of {total} files need scraping")
+
     if not pending_scrapes:
         print("✅ No new HTML files to scrape. Everything is already up to date.")
         return
@@ -66,34 +37,16 @@ def main():
         measure=first_scrape[4],
         period_type="weekly"
     )
-    driver = start_logged_in_browser(first_url)
-    
-    # Scrape files
-    start_time = time.time()
-    for i, (level, song_obj, period_value, html_file, measure) in enumerate(pending_scrapes):
-        url = build_scrape_url(
-            period_value,
-            song_obj["id"] if song_obj else None,
-            measure=measure,
-            period_type="weekly",
-            log_urls=args.log_urls
-        )
-        
-        current_song_name = song_obj["name"] if song_obj else None
+    driver = get_authenticated_driver(first_url)
+
+    # Scrape files across a pool of logged-in drivers
+    scrape_files_concurrently(
+        driver,
+        pending_scrapes,
+        period_type="weekly",
+        log_urls=args.log_urls
+    )
 
-        scrape_file(
-            driver,
-            url,
-            html_file,
-            level=level,
-            measure=measure,
-            period_type="weekly",
-            period_value=period_value,
-            song_name=current_song_name,
-            log_urls=args.log_urls
-        )
-        print_progress(i, len(pending_scrapes), start_time)
-    
     driver.quit()
     print("\n🎉 All weekly scraping complete.")
 
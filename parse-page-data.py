@@ -12,8 +12,8 @@ from file_utils import (
     get_file_path,
     get_csv_path,
     get_file_key,
-    ensure_directory_exists
-
+    ensure_directory_exists,
+    open_html_source
 )
 import argparse
 import os
@@ -43,9 +43,10 @@ def parse_file(week, song_id, group_by, measure, period_type='weekly', level='so
     # Only look up song name for song-level data
     song_name = "Artist Level" if level == "artist" else next((s["name"] for s in songs_to_scrape if s["id"] == song_id), "Unknown")
 
-    # Load HTML and parse
+    # Load HTML and parse; open_html_source handles both gzipped and
+    # legacy uncompressed outputs
     try:
-        with open(html_file, "r", encoding="utf-8") as f:
+        with open_html_source(html_file) as f:
             soup = BeautifulSoup(f, "html.parser")
     except FileNotFoundError:
         print(f"❌ Missing HTML source: {html_file}")
@@ -198,7 +198,9 @@ def load_and_prepare_data(data_dir: str = "parsed csvs",
     data_dir : str, default="parsed csvs"
         Directory containing the CSV files
     output_file : Optional[str], default="song_velocity_table.csv"
-        If provided, save the prepared DataFrame to this file
+        If provided, save the prepared DataFrame to this file. A
+        .parquet extension writes typed, zstd-compressed Parquet
+        instead of CSV
         
     Returns:
     --------
@@ -216,9 +218,13 @@ def load_and_prepare_data(data_dir: str = "parsed csvs",
     # Prepare the DataFrame
     df = prepare_dataframe(df)
     
-    # Save to file if requested
+    # Save to file if requested; Parquet keeps dtypes and loads much
+    # faster than re-tokenizing CSV downstream
     if output_file:
-        df.to_csv(output_file, index=False)
+        if output_file.endswith('.parquet'):
+            df.to_parquet(output_file, engine='pyarrow', compression='zstd')
+        else:
+            df.to_csv(output_file, index=False)
         print(f"✅ {output_file} created with prepared data")
     
     return df
@@ -26,11 +26,15 @@ def plot_city_trends(df: pd.DataFrame,
         Figure size (width, height)
     """
     plt.figure(figsize=figsize)
-    
-    for city in cities:
-        city_data = df[df['city'] == city]
-        plt.plot(city_data['week'], city_data[metric], label=city, marker='o')
-    
+
+    # Single long-form pass with hue instead of one boolean scan per city
+    sns.lineplot(data=df[df['city'].isin(cities)],
+                 x='week',
+                 y=metric,
+                 hue='city',
+                 hue_order=cities,
+                 marker='o')
+
     plt.title(title)
     plt.xlabel('Week')
     plt.ylabel(metric.replace('_', ' ').title())
@@ -183,25 +187,20 @@ def plot_streams_per_listener_trends(df: pd.DataFrame,
     
     plt.figure(figsize=figsize)
     
+    # One long-form lineplot with hue instead of re-slicing the frame per
+    # city (and per song): a single pass over the data draws every series
+    plot_df = ratio_df[ratio_df['city'].isin(cities)].copy()
     if level == 'song':
-        # Plot each song separately
-        for city in cities:
-            city_data = ratio_df[ratio_df['city'] == city]
-            for song in city_data['song'].unique():
-                song_data = city_data[city_data['song'] == song]
-                plt.plot(song_data['week'], 
-                        song_data['streams_per_listener'], 
-                        label=f"{city} - {song}", 
-                        marker='o')
+        plot_df['series'] = plot_df['city'] + ' - ' + plot_df['song']
     else:
-        # Plot artist level data
-        for city in cities:
-            city_data = ratio_df[ratio_df['city'] == city]
-            plt.plot(city_data['week'], 
-                    city_data['streams_per_listener'], 
-                    label=city, 
-                    marker='o')
-    
+        plot_df['series'] = plot_df['city']
+
+    sns.lineplot(data=plot_df,
+                 x='week',
+                 y='streams_per_listener',
+                 hue='series',
+                 marker='o')
+
     plt.title(f'Streams per Listener Trends ({level.title()} Level)')
     plt.xlabel('Week')
     plt.ylabel('Streams per Listener')
@@ -406,14 +405,15 @@ def plot_metric_trends_by_category(df: pd.DataFrame,
         Figure size (width, height)
     """
     plt.figure(figsize=figsize)
-    
-    for category in df[category_col].unique():
-        category_data = df[df[category_col] == category]
-        plt.plot(category_data['week'], 
-                category_data[metric], 
-                label=category, 
-                marker='o')
-    
+
+    # Single long-form pass with hue instead of one boolean scan per category
+    sns.lineplot(data=df,
+                 x='week',
+                 y=metric,
+                 hue=category_col,
+                 hue_order=df[category_col].unique(),
+                 marker='o')
+
     plt.title(title)
     plt.xlabel('Week')
     plt.ylabel(metric.replace('_', ' ').title())
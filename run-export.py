@@ -6,14 +6,14 @@ from config import (
     songs_to_scrape,
     group_by,
     get_valid_weeks_for_song,
-    raw_week_endings,
-    raw_month_starts,
+    get_raw_week_endings,
+    get_raw_month_starts,
     get_file_path,
     build_scrape_url,
-    start_logged_in_browser,
-    scrape_file,
-    print_progress,
+    get_authenticated_driver,
+    scrape_files_concurrently,
     build_pending_scrapes,
+    get_file_key,
     print_scraping_plan,
     print_parsing_plan,
     get_existing_parsed_files
@@ -118,34 +118,16 @@ def main():
             period_type="monthly" if data_type == 'm' else "weekly",
             log_urls=args.log_urls
         )
-        driver = start_logged_in_browser(first_url)
-        
-        # Scrape files
-        start_time = time.time()
-        for i, (level, song_obj, period_value, html_file, measure) in enumerate(pending_scrapes):
-            url = build_scrape_url(
-                period_value,
-                song_obj["id"] if song_obj else None,
-                measure=measure,
-                period_type="monthly" if data_type == 'm' else "weekly",
-                log_urls=args.log_urls
-            )
-            
-            current_song_name = song_obj["name"] if song_obj else None
-            
-            scrape_file(
-                driver, 
-                url, 
-                html_file, 
-                level=level,
-                measure=measure,
-                period_type="monthly" if data_type == 'm' else "weekly",
-                period_value=period_value,
-                song_name=current_song_name,
-                log_urls=args.log_urls
-            )
-            print_progress(i, len(pending_scrapes), start_time)
-        
+        driver = get_authenticated_driver(first_url)
+
+        # Scrape files across a pool of logged-in drivers
+        scrape_files_concurrently(
+            driver,
+            pending_scrapes,
+            period_type="monthly" if data_type == 'm' else "weekly",
+            log_urls=args.log_urls
+        )
+
         driver.quit()
         print("\n🎉 All scraping complete.")
 
@@ -159,9 +141,9 @@ def main():
     for measure in measures:
         for level in levels:
             if level == "artist":
-                periods = raw_month_starts if data_type == 'm' else raw_week_endings
+                periods = get_raw_month_starts() if data_type == 'm' else get_raw_week_endings()
                 for period in periods:
-                    file_key = (
+                    file_key = get_file_key(
                         "monthly" if data_type == 'm' else "weekly",
                         measure,
                         group_by,
@@ -188,9 +170,9 @@ def main():
             else:
                 for song in songs_to_scrape:
                     song_id = song["id"]
-                    periods = raw_month_starts if data_type == 'm' else get_valid_weeks_for_song(song)
+                    periods = get_raw_month_starts() if data_type == 'm' else get_valid_weeks_for_song(song)
                     for period in periods:
-                        file_key = (
+                        file_key = get_file_key(
                             "monthly" if data_type == 'm' else "weekly",
                             measure,
                             group_by,